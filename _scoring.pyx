@@ -0,0 +1,39 @@
+# cython: language_level=3
+"""
+Keyword Scoring Module (Cython)
+Compiled build of _scoring_py; behavior must stay identical to it.
+Build with: python setup.py build_ext --inplace
+"""
+
+from _scoring_py import CLASS_FR, CLASS_NFR
+
+cdef int _FR = CLASS_FR
+cdef int _NFR = CLASS_NFR
+
+
+cpdef int keyword_score(object automaton, str text_lower):
+    """Count the distinct keywords of an automaton found in text"""
+    cdef set keywords = set()
+    for _, keyword in automaton.iter(text_lower):
+        keywords.add(keyword)
+    return len(keywords)
+
+
+cpdef tuple fused_scan(object automaton, str text_lower, tuple keyword_class):
+    """Scan text once and accumulate FR/NFR scores from keyword class bits"""
+    cdef set keyword_ids = set()
+    cdef int fr_score = 0
+    cdef int nfr_score = 0
+    cdef int class_bits = 0
+    cdef int mask
+    
+    for _, keyword_id in automaton.iter(text_lower):
+        keyword_ids.add(keyword_id)
+    
+    for keyword_id in keyword_ids:
+        mask = keyword_class[keyword_id]
+        fr_score += mask & _FR
+        nfr_score += (mask & _NFR) >> 1
+        class_bits |= mask
+    
+    return fr_score, nfr_score, class_bits, keyword_ids
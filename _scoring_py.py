@@ -0,0 +1,88 @@
+"""
+Keyword Scoring Module
+Pure-Python scoring loops used by the classifier; _scoring.pyx is a
+Cython build of the same functions, used instead when it is compiled
+"""
+
+# Keyword class bits (a keyword may belong to several classes)
+CLASS_FR = 1
+CLASS_NFR = 2
+CLASS_PERF = 4
+CLASS_QUALITY = 8
+
+
+def keyword_score(automaton, text_lower):
+    """
+    Count the distinct keywords of an automaton found in text
+    
+    Args:
+        automaton (ahocorasick.Automaton): Automaton whose values are the keywords
+        text_lower (str): Lowercased text to scan
+        
+    Returns:
+        int: Number of distinct keywords matched
+    """
+    return len({keyword for _, keyword in automaton.iter(text_lower)})
+
+
+def fused_scan(automaton, text_lower, keyword_class):
+    """
+    Scan text once and accumulate FR/NFR scores from keyword class bits
+    
+    Args:
+        automaton (ahocorasick.Automaton): Automaton whose values are keyword ids
+        text_lower (str): Lowercased text to scan
+        keyword_class (tuple): Class bitmask for each keyword id
+        
+    Returns:
+        tuple: (fr_score, nfr_score, class_bits, keyword_ids)
+    """
+    keyword_ids = {keyword_id for _, keyword_id in automaton.iter(text_lower)}
+    
+    fr_score = nfr_score = 0
+    class_bits = 0
+    for keyword_id in keyword_ids:
+        mask = keyword_class[keyword_id]
+        fr_score += mask & CLASS_FR
+        nfr_score += (mask & CLASS_NFR) >> 1
+        class_bits |= mask
+    
+    return fr_score, nfr_score, class_bits, keyword_ids
+
+
+def build_specialized_scan(keyword_ids, keyword_class):
+    """
+    Generate a scan function with every keyword inlined as a constant
+    
+    The generated function tests each keyword with a plain `in` check and
+    returns the same values as fused_scan without needing an automaton.
+    Each check is a full scan of the text, so it only pays off for very
+    small keyword sets (see config.SPECIALIZE_KEYWORD_SCAN).
+    
+    Args:
+        keyword_ids (dict): Keyword -> id
+        keyword_class (tuple): Class bitmask for each keyword id
+        
+    Returns:
+        callable: scan(text_lower) -> (fr_score, nfr_score, class_bits, keyword_ids)
+    """
+    lines = [
+        'def scan(t):',
+        '    fr_score = nfr_score = class_bits = 0',
+        '    keyword_ids = set()',
+    ]
+    for keyword, keyword_id in keyword_ids.items():
+        mask = keyword_class[keyword_id]
+        lines.append(f'    if {keyword!r} in t:')
+        lines.append(f'        keyword_ids.add({keyword_id})')
+        if mask & CLASS_FR:
+            lines.append('        fr_score += 1')
+        if mask & CLASS_NFR:
+            lines.append('        nfr_score += 1')
+        if mask:
+            lines.append(f'        class_bits |= {mask}')
+    lines.append('    return fr_score, nfr_score, class_bits, keyword_ids')
+    
+    namespace = {}
+    exec(compile('\n'.join(lines), '<specialized_scan>', 'exec'), namespace)
+    return namespace['scan']
@@ -0,0 +1,26 @@
+# cython: language_level=3
+"""
+Token Processing Module (Cython)
+Compiled build of _tokens_py; behavior must stay identical to it.
+Build with: python setup.py build_ext --inplace
+"""
+
+
+cpdef tuple process_tagged(object pos_tags, object stop_words, object lemma,
+                           object verb_tags, object noun_tags):
+    """Extract verbs and nouns, remove stopwords and lemmatize in one pass"""
+    cdef list verbs = []
+    cdef list nouns = []
+    cdef list filtered_tokens = []
+    cdef list lemmatized_tokens = []
+    
+    for token, tag in pos_tags:
+        if tag in verb_tags:
+            verbs.append(token)
+        elif tag in noun_tags:
+            nouns.append(token)
+        if token not in stop_words:
+            filtered_tokens.append(token)
+            lemmatized_tokens.append(lemma(token))
+    
+    return verbs, nouns, filtered_tokens, lemmatized_tokens
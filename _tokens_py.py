@@ -0,0 +1,36 @@
+"""
+Token Processing Module
+Pure-Python per-sentence token loop used by the preprocessor; _tokens.pyx
+is a Cython build of the same function, used instead when it is compiled
+"""
+
+
+def process_tagged(pos_tags, stop_words, lemma, verb_tags, noun_tags):
+    """
+    Extract verbs and nouns, remove stopwords and lemmatize in one pass
+    
+    Args:
+        pos_tags (list): List of (token, pos_tag) tuples, tokens lowercased
+        stop_words (frozenset): Stopwords to drop
+        lemma (callable): Lemmatize function for a single token
+        verb_tags (frozenset): POS tags counted as verbs
+        noun_tags (frozenset): POS tags counted as nouns
+        
+    Returns:
+        tuple: (verbs, nouns, filtered_tokens, lemmatized_tokens)
+    """
+    verbs = []
+    nouns = []
+    filtered_tokens = []
+    lemmatized_tokens = []
+    
+    for token, tag in pos_tags:
+        if tag in verb_tags:
+            verbs.append(token)
+        elif tag in noun_tags:
+            nouns.append(token)
+        if token not in stop_words:
+            filtered_tokens.append(token)
+            lemmatized_tokens.append(lemma(token))
+    
+    return verbs, nouns, filtered_tokens, lemmatized_tokens
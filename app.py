@@ -1,18 +1,260 @@
 """
 Flask Web Application for FR/NFR Extraction System
 Provides a web interface for the system
+
+Served by gevent's WSGI server so slow uploads and responses don't block
+other requests. For CPU parallelism run several workers, e.g.:
+    gunicorn -k gevent -w 4 app:app
 """
 
-from flask import Flask, render_template, request, jsonify
+from gevent import monkey
+monkey.patch_all()
+
+from flask import Flask, render_template, request, jsonify, url_for, Response, stream_with_context
+from gevent.pywsgi import WSGIServer
+import hashlib
 import os
+import sys
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+import diskcache
+import orjson
 import pandas as pd
+import _scoring_py
+import _tokens_py
+import config
+import requirement_classifier
+import requirement_extractor
+import text_preprocessor
 from requirement_classifier import RequirementClassifier
 
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 
-# Initialize classifier
-classifier = RequirementClassifier()
+@lru_cache(maxsize=1)
+def get_classifier():
+    """
+    Get the shared classifier, creating it on first use
+    
+    Under gunicorn with preload_app (see gunicorn.conf.py) this is called
+    once in the master, so forked workers share the loaded NLP resources.
+    
+    Returns:
+        RequirementClassifier: Shared classifier instance
+    """
+    return RequirementClassifier()
+
+# Persistent cache of classification results, keyed by input hash
+cache = diskcache.Cache('./.reqcache', size_limit=1 << 30)
+
+def _pipeline_version():
+    """Hash the config and pipeline sources so cached results expire when they change"""
+    modules = {config, text_preprocessor, requirement_extractor, requirement_classifier,
+               _scoring_py, _tokens_py}
+    # Plus the compiled extensions, when they were imported instead
+    modules.add(sys.modules[requirement_classifier.fused_scan.__module__])
+    modules.add(sys.modules[text_preprocessor.process_tagged.__module__])
+    
+    digest = hashlib.blake2b(digest_size=8)
+    for module in sorted(modules, key=lambda module: module.__name__):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+CACHE_VERSION = _pipeline_version()
+
+def _cache_key(kind, digest):
+    """
+    Build a versioned cache key for an input
+    
+    Args:
+        kind (str): Input kind ('text', 'lines' or 'csv')
+        digest: hashlib hash object fed with the input
+        
+    Returns:
+        str: Cache key
+    """
+    return f"{CACHE_VERSION}:{kind}:{digest.hexdigest()}"
+
+@lru_cache(maxsize=1)
+def get_executor():
+    """
+    Get the process pool for background jobs, creating it on first use
+    
+    Processes rather than threads, as classification is CPU-bound. Each web
+    worker gets an equal share of config.JOB_PROCESSES, so the deployment
+    as a whole runs that many job processes.
+    
+    Returns:
+        ProcessPoolExecutor: Shared executor
+    """
+    return ProcessPoolExecutor(max_workers=max(1, config.JOB_PROCESSES // config.WEB_WORKERS))
+
+def _discard_executor(executor):
+    """Drop a broken process pool, unless it has already been replaced"""
+    if get_executor.cache_info().currsize and get_executor() is executor:
+        get_executor.cache_clear()
+
+# Background job status lives in the disk cache, so any web worker can
+# answer a poll: job key -> {'status': 'running' | 'done' | 'error', ...}.
+# Entries expire after config.JOB_TTL if nobody fetches the results.
+def _job_key(job_id):
+    """Build the cache key holding a background job's status"""
+    return f"job:{job_id}"
+
+def _run_job(job_id, key, func, data):
+    """
+    Run a background job in a worker process and record its outcome
+    
+    Args:
+        job_id (str): Job id
+        key (str): Cache key to store the results under
+        func (callable): Job function
+        data: Argument for the job function
+    """
+    try:
+        cache.set(key, func(data))
+        status = {'status': 'done', 'key': key}
+    except Exception as e:
+        status = {'status': 'error', 'error': str(e)}
+    cache.set(_job_key(job_id), status, expire=config.JOB_TTL)
+
+def _classify_text_file_job(path):
+    """Classify a spooled text upload line by line in a worker process, then delete it"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return get_classifier().classify_iterable(f, split_sentences=True)
+    finally:
+        os.remove(path)
+
+def _classify_rows_job(rows):
+    """Classify one user story per row in a worker process"""
+    return get_classifier().classify_iterable(rows)
+
+def _job_done(job_id, spool_path, executor, future):
+    """
+    Record the failure of a job whose process died (e.g. was killed)
+    
+    _run_job records the outcome of jobs that finish; a job whose process
+    died never gets that far, and leaves the pool broken.
+    
+    Args:
+        job_id (str): Job id
+        spool_path (str): Spooled upload to delete if the job didn't, or None
+        executor (ProcessPoolExecutor): Pool the job was submitted to
+        future (Future): The job's future
+    """
+    if future.cancelled():
+        error = 'Job was cancelled'
+    elif future.exception() is not None:
+        error = str(future.exception()) or type(future.exception()).__name__
+    else:
+        return
+    
+    if isinstance(future.exception(), BrokenProcessPool):
+        # The next job gets a fresh pool
+        _discard_executor(executor)
+    if spool_path is not None and os.path.exists(spool_path):
+        os.remove(spool_path)
+    
+    cache.set(_job_key(job_id), {'status': 'error', 'error': error}, expire=config.JOB_TTL)
+
+def _submit_job(key, func, data, spool_path=None):
+    """
+    Start a background classification job
+    
+    Args:
+        key (str): Cache key to store the results under
+        func (callable): Job function to run in the executor
+        data: Argument for the job function
+        spool_path (str): Spooled upload the job deletes, removed here if
+            the job's process dies
+        
+    Returns:
+        tuple: 202 response with the job id and its status URL
+    """
+    job_id = uuid.uuid4().hex
+    cache.set(_job_key(job_id), {'status': 'running'}, expire=config.JOB_TTL)
+    
+    try:
+        executor = get_executor()
+        try:
+            future = executor.submit(_run_job, job_id, key, func, data)
+        except BrokenProcessPool:
+            # A job process died since the last submit; retry on a fresh pool
+            _discard_executor(executor)
+            executor = get_executor()
+            future = executor.submit(_run_job, job_id, key, func, data)
+    except Exception:
+        cache.delete(_job_key(job_id))
+        raise
+    
+    future.add_done_callback(partial(_job_done, job_id, spool_path, executor))
+    
+    return jsonify({
+        'job_id': job_id,
+        'status_url': url_for('analyze_status', job_id=job_id)
+    }), 202
+
+def _classify_text_cached(text):
+    """Classify text, reusing cached results for previously seen input"""
+    key = _cache_key('text', hashlib.blake2b(text.encode('utf-8')))
+    results = cache.get(key)
+    
+    if results is None:
+        results = get_classifier().classify_text(text)
+        cache.set(key, results)
+    
+    return results
+
+def _generate_json(results):
+    """
+    Serialize classification results as JSON, one requirement at a time
+    
+    Args:
+        results (dict): Classification results from the classifier
+        
+    Yields:
+        bytes: Chunks of the JSON response body
+    """
+    yield (b'{"success":true,"total_requirements":%d,"fr_count":%d,"nfr_count":%d,'
+           b'"functional_requirements":[' % (results['total_requirements'],
+                                             results['fr_count'],
+                                             results['nfr_count']))
+    
+    for i, fr in enumerate(results['functional_requirements']):
+        if i:
+            yield b','
+        yield orjson.dumps({
+            'requirement': fr['requirement'],
+            'original': fr['original_sentence'],
+            'confidence': f"{fr['confidence']:.0%}",
+            'verbs': fr['verbs'],
+            'nouns': fr['nouns']
+        })
+    
+    yield b'],"non_functional_requirements":['
+    
+    for i, nfr in enumerate(results['non_functional_requirements']):
+        if i:
+            yield b','
+        yield orjson.dumps({
+            'requirement': nfr['requirement'],
+            'original': nfr['original_sentence'],
+            'category': nfr['nfr_category'],
+            'confidence': f"{nfr['confidence']:.0%}",
+            'verbs': nfr['verbs'],
+            'nouns': nfr['nouns']
+        })
+    
+    yield b']}'
+
+def _json_stream_response(results):
+    """Stream classification results as a JSON response"""
+    return Response(stream_with_context(_generate_json(results)), mimetype='application/json')
 
 @app.route('/')
 def index():
@@ -30,45 +272,22 @@ def analyze():
             return jsonify({'error': 'No input text provided'}), 400
         
         # Classify requirements
-        results = classifier.classify_text(text)
-        
-        # Format for JSON response
-        response = {
-            'success': True,
-            'total_requirements': results['total_requirements'],
-            'fr_count': results['fr_count'],
-            'nfr_count': results['nfr_count'],
-            'functional_requirements': [
-                {
-                    'requirement': fr['requirement'],
-                    'original': fr['original_sentence'],
-                    'confidence': f"{fr['confidence']:.0%}",
-                    'verbs': fr['verbs'],
-                    'nouns': fr['nouns']
-                }
-                for fr in results['functional_requirements']
-            ],
-            'non_functional_requirements': [
-                {
-                    'requirement': nfr['requirement'],
-                    'original': nfr['original_sentence'],
-                    'category': nfr['nfr_category'],
-                    'confidence': f"{nfr['confidence']:.0%}",
-                    'verbs': nfr['verbs'],
-                    'nouns': nfr['nouns']
-                }
-                for nfr in results['non_functional_requirements']
-            ]
-        }
-        
-        return jsonify(response)
+        results = _classify_text_cached(text)
+        
+        return _json_stream_response(results)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/analyze_file', methods=['POST'])
 def analyze_file():
-    """Analyze user stories from uploaded file"""
+    """
+    Analyze user stories from uploaded file
+    
+    Previously seen files are answered directly from the cache. Otherwise
+    classification runs in a background process and 202 is returned with
+    a job id; poll /analyze_status/<job_id> for the results.
+    """
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file uploaded'}), 400
@@ -78,52 +297,79 @@ def analyze_file():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        # Read file content
+        # Read the upload incrementally, hashing it for the cache as we go
+        digest = hashlib.blake2b()
+        
         if file.filename.endswith('.txt'):
-            text = file.read().decode('utf-8')
+            # Spool the upload to disk so the job can read it as a stream
+            has_text = False
+            with tempfile.NamedTemporaryFile(suffix='.txt', delete=False) as spool:
+                for raw_line in file.stream:
+                    digest.update(raw_line)
+                    spool.write(raw_line)
+                    has_text = has_text or bool(raw_line.strip())
+            
+            if not has_text:
+                os.remove(spool.name)
+                return jsonify({'error': 'File is empty'}), 400
+            
+            key = _cache_key('lines', digest)
+            results = cache.get(key)
+            
+            if results is None:
+                try:
+                    return _submit_job(key, _classify_text_file_job, spool.name, spool_path=spool.name)
+                except Exception:
+                    os.remove(spool.name)
+                    raise
+            os.remove(spool.name)
         elif file.filename.endswith('.csv'):
-            df = pd.read_csv(file)
-            # Assume first column contains user stories
-            text = '\n'.join(df.iloc[:, 0].astype(str).tolist())
+            rows = []
+            for chunk in pd.read_csv(file.stream, chunksize=10000):
+                # Assume first column contains user stories, one per row
+                chunk_rows = chunk.iloc[:, 0].dropna().astype(str).tolist()
+                digest.update('\n'.join(chunk_rows).encode('utf-8') + b'\n')
+                rows.extend(chunk_rows)
+            
+            if not rows:
+                return jsonify({'error': 'File is empty'}), 400
+            
+            key = _cache_key('csv', digest)
+            results = cache.get(key)
+            
+            if results is None:
+                return _submit_job(key, _classify_rows_job, rows)
         else:
             return jsonify({'error': 'Unsupported file format. Use .txt or .csv'}), 400
         
-        if not text.strip():
-            return jsonify({'error': 'File is empty'}), 400
+        return _json_stream_response(results)
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/analyze_status/<job_id>')
+def analyze_status(job_id):
+    """Return the results of a background analysis job, or 202 while it runs"""
+    try:
+        job = cache.get(_job_key(job_id))
         
-        # Classify requirements
-        results = classifier.classify_text(text)
-        
-        # Format for JSON response
-        response = {
-            'success': True,
-            'total_requirements': results['total_requirements'],
-            'fr_count': results['fr_count'],
-            'nfr_count': results['nfr_count'],
-            'functional_requirements': [
-                {
-                    'requirement': fr['requirement'],
-                    'original': fr['original_sentence'],
-                    'confidence': f"{fr['confidence']:.0%}",
-                    'verbs': fr['verbs'],
-                    'nouns': fr['nouns']
-                }
-                for fr in results['functional_requirements']
-            ],
-            'non_functional_requirements': [
-                {
-                    'requirement': nfr['requirement'],
-                    'original': nfr['original_sentence'],
-                    'category': nfr['nfr_category'],
-                    'confidence': f"{nfr['confidence']:.0%}",
-                    'verbs': nfr['verbs'],
-                    'nouns': nfr['nouns']
-                }
-                for nfr in results['non_functional_requirements']
-            ]
-        }
-        
-        return jsonify(response)
+        if job is None:
+            return jsonify({'error': 'Unknown job id'}), 404
+        
+        if job['status'] == 'running':
+            return jsonify({'job_id': job_id, 'status': 'running'}), 202
+        
+        # Finished: the results (or error) are handed out once
+        cache.delete(_job_key(job_id))
+        
+        if job['status'] == 'error':
+            return jsonify({'error': job['error']}), 500
+        
+        results = cache.get(job['key'])
+        if results is None:
+            return jsonify({'error': 'Job results have expired'}), 404
+        
+        return _json_stream_response(results)
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -141,4 +387,4 @@ if __name__ == '__main__':
     print("\nPress Ctrl+C to stop the server")
     print("=" * 60 + "\n")
     
-    app.run(debug=False, host='127.0.0.1', port=5000)
+    WSGIServer(('127.0.0.1', 5000), app).serve_forever()
@@ -2,6 +2,9 @@
 Configuration file for the FR/NFR Extraction System
 """
 
+import os
+import re
+
 # Functional Requirement Keywords
 FUNCTIONAL_KEYWORDS = [
     'create', 'add', 'delete', 'remove', 'update', 'edit', 'view', 'display',
@@ -38,6 +41,9 @@ NFR_CATEGORIES = {
     'portability': ['portable', 'compatible', 'cross-platform']
 }
 
+# Reverse index of NFR_CATEGORIES: keyword -> category
+KEYWORD_TO_CATEGORY = {kw: cat for cat, kws in NFR_CATEGORIES.items() for kw in kws}
+
 # User Story Patterns
 USER_STORY_PATTERNS = [
     r'as a (.*?), i want (.*?) so that (.*)',
@@ -47,11 +53,65 @@ USER_STORY_PATTERNS = [
     r'(system|application) (should|must|shall|will) (.*)',
 ]
 
+# Performance indicator keywords (NFR detection)
+PERFORMANCE_KEYWORDS = ['fast', 'quick', 'speed', 'performance', 'load time', 'response time']
+
+# Performance indicator patterns (NFR detection)
+PERFORMANCE_PATTERNS = [
+    r'\d+\s*(millisecond|second|minute|ms|s|min)',
+    r'within\s+\d+',
+    r'concurrent\s+users?',
+    r'\d+%\s*(uptime|availability)'
+]
+
+# Precompiled patterns (compiled once at import time)
+COMPILED_USER_STORY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in USER_STORY_PATTERNS)
+COMPILED_PERF_PATTERNS = tuple(re.compile(p) for p in PERFORMANCE_PATTERNS) + (
+    re.compile('|'.join(re.escape(kw) for kw in PERFORMANCE_KEYWORDS)),
+)
+COMPILED_PERF_PATTERN_ALTERNATION = re.compile('|'.join(f'(?:{p})' for p in PERFORMANCE_PATTERNS))
+
+# How FR/NFR keyword scores are computed:
+# 'substring' - count keywords occurring anywhere in the extracted requirement
+# 'token'     - intersect the sentence's lemmatized tokens with the keyword sets
+#               (whole words only; multi-word keywords are not matched)
+KEYWORD_MATCHING = 'substring'
+
+# Replace the Aho-Corasick keyword scan with a function generated at import
+# time that inlines every keyword. With the current keyword lists this is
+# several times slower than the automaton, so it is off by default.
+SPECIALIZE_KEYWORD_SCAN = False
+
 # Requirement indicators
 REQUIREMENT_INDICATORS = [
     'should', 'must', 'shall', 'will', 'can', 'need to', 'able to',
     'want to', 'would like to', 'require', 'required'
 ]
 
+# NLP backend used by the text preprocessor:
+# 'nltk'  - NLTK tokenizers, perceptron tagger and WordNet lemmatizer
+# 'spacy' - spaCy pipeline (requires `pip install spacy` and the model below)
+NLP_BACKEND = 'nltk'
+SPACY_MODEL = 'en_core_web_sm'
+
+# Sentence splitter used by TextPreprocessor.tokenize_sentences:
+# 'nltk'  - Punkt (sent_tokenize); reproduces existing outputs
+# 'spacy' - spaCy's rule-based sentencizer (no model needed, faster)
+SENTENCE_SPLITTER = 'nltk'
+
+# Lemmatizer used by the NLTK backend (the spaCy backend uses its own lemmas):
+# 'wordnet'   - NLTK's WordNetLemmatizer (needs the wordnet and omw-1.4 corpora)
+# 'simplemma' - simplemma's rule/dictionary lemmatizer (requires `pip install simplemma`,
+#               no corpus download)
+LEMMATIZER = 'wordnet'
+
 # Stopwords to be removed (will be supplemented by NLTK)
 CUSTOM_STOPWORDS = ['i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves']
+
+# Web server processes (gunicorn workers), and the total number of background
+# job processes shared out between them across the whole deployment
+WEB_WORKERS = os.cpu_count() or 1
+JOB_PROCESSES = os.cpu_count() or 1
+
+# Seconds a background job's status is kept if nobody fetches its results
+JOB_TTL = 3600
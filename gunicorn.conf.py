@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for the FR/NFR Extraction System web interface
+Run with: gunicorn app:app
+"""
+
+import config
+
+bind = '127.0.0.1:5000'
+workers = config.WEB_WORKERS
+worker_class = 'gevent'
+
+# Import the app once in the master so workers are forked from it
+preload_app = True
+
+
+def when_ready(server):
+    """Load the classifier in the master before workers are forked"""
+    from app import get_classifier
+    get_classifier()
@@ -4,9 +4,95 @@ Classifies requirements as Functional (FR) or Non-Functional (NFR)
 """
 
 import re
+from collections import Counter
+from functools import lru_cache
+import ahocorasick
 from requirement_extractor import RequirementExtractor
+from text_preprocessor import TextPreprocessor
+from _scoring_py import CLASS_FR, CLASS_NFR, CLASS_PERF, CLASS_QUALITY, build_specialized_scan
 import config
 
+# Use the compiled scoring loops when built (see setup.py)
+try:
+    from _scoring import keyword_score, fused_scan
+except ImportError:
+    from _scoring_py import keyword_score, fused_scan
+
+# Quality attribute words (NFR indicators)
+_QUALITY_WORDS = [
+    'secure', 'security', 'reliable', 'available', 'scalable',
+    'maintainable', 'usable', 'portable', 'efficient', 'stable',
+    'robust', 'user-friendly', 'intuitive', 'compatible'
+]
+_QUALITY_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _QUALITY_WORDS)) + r')\b', re.IGNORECASE)
+
+
+def _encode_keywords():
+    """
+    Assign every scoring keyword an integer id and a class bitmask
+    
+    NFR category keywords are included too (possibly with an empty
+    bitmask) so that one scan also yields the category evidence.
+    
+    Returns:
+        tuple: (dict mapping keyword to id, tuple of class bitmasks indexed by id)
+    """
+    classes = dict.fromkeys(config.KEYWORD_TO_CATEGORY, 0)
+    for class_bit, keywords in ((CLASS_FR, config.FUNCTIONAL_KEYWORDS),
+                                (CLASS_NFR, config.NON_FUNCTIONAL_KEYWORDS),
+                                (CLASS_PERF, config.PERFORMANCE_KEYWORDS),
+                                (CLASS_QUALITY, _QUALITY_WORDS)):
+        for keyword in keywords:
+            keyword = keyword.lower()
+            classes[keyword] = classes.get(keyword, 0) | class_bit
+    
+    keyword_ids = {keyword: i for i, keyword in enumerate(classes)}
+    return keyword_ids, tuple(classes.values())
+
+
+KEYWORD_IDS, KEYWORD_CLASS = _encode_keywords()
+KEYWORD_CATEGORY = tuple(config.KEYWORD_TO_CATEGORY.get(kw) for kw in KEYWORD_IDS)
+
+# Keyword scan specialized for the configured keywords (optional)
+_specialized_scan = (
+    build_specialized_scan(KEYWORD_IDS, KEYWORD_CLASS) if config.SPECIALIZE_KEYWORD_SCAN else None
+)
+
+# Fields produced by RequirementClassifier._classify_core, in order
+_SCORE_FIELDS = ('classification', 'confidence', 'fr_score', 'nfr_score', 'nfr_category')
+
+
+def _build_automaton(items):
+    """
+    Build an Aho-Corasick automaton over keywords
+    
+    Args:
+        items (iterable): (keyword, value) pairs; value is yielded on match
+        
+    Returns:
+        ahocorasick.Automaton: Automaton ready for scanning
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword, value in items:
+        automaton.add_word(keyword, value)
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=32)
+def _keyword_automaton(keywords):
+    """
+    Get the automaton for a keyword set, building it on first use
+    
+    Args:
+        keywords (frozenset): Keywords to match
+        
+    Returns:
+        ahocorasick.Automaton: Automaton yielding the matched keyword
+    """
+    return _build_automaton((kw, kw) for kw in keywords)
+
+
 class RequirementClassifier:
     """
     Classifies requirements into Functional and Non-Functional categories
@@ -17,6 +103,57 @@ class RequirementClassifier:
         self.extractor = RequirementExtractor()
         self.functional_keywords = set([kw.lower() for kw in config.FUNCTIONAL_KEYWORDS])
         self.nfr_keywords = set([kw.lower() for kw in config.NON_FUNCTIONAL_KEYWORDS])
+        
+        # Keywords lemmatized like the tokens they are matched against in
+        # token mode (e.g. "users" -> "user")
+        lemma = TextPreprocessor._get_lemma()
+        self._functional_lemmas = frozenset(lemma(kw) for kw in self.functional_keywords)
+        self._nfr_lemmas = frozenset(lemma(kw) for kw in self.nfr_keywords)
+        
+        # Keyword automaton, built once and scanned once per text
+        self._combined_automaton = _build_automaton(KEYWORD_IDS.items())
+        
+        # Per-instance cache of scoring results (a class-level lru_cache
+        # would be shared by all instances and keep them alive)
+        self._classify_core = lru_cache(maxsize=4096)(self._classify_core_impl)
+    
+    def _scan_keyword_ids(self, text_lower):
+        """
+        Scan text once and collect the ids of all distinct keywords found
+        
+        Args:
+            text_lower (str): Lowercased text to analyze
+            
+        Returns:
+            set: Matched keyword ids (see KEYWORD_IDS)
+        """
+        return {keyword_id for _, keyword_id in self._combined_automaton.iter(text_lower)}
+    
+    def _fused_scan(self, text_lower):
+        """
+        Compute all keyword-based signals in a single pass over the text
+        
+        Args:
+            text_lower (str): Lowercased text to analyze
+            
+        Returns:
+            tuple: (fr_score, nfr_score, has_performance, has_quality, keyword_ids)
+        """
+        if _specialized_scan is not None:
+            fr_score, nfr_score, class_bits, keyword_ids = _specialized_scan(text_lower)
+        else:
+            fr_score, nfr_score, class_bits, keyword_ids = fused_scan(
+                self._combined_automaton, text_lower, KEYWORD_CLASS)
+        
+        has_performance = bool(class_bits & CLASS_PERF)
+        # Quality words only count as whole words (e.g. not "securely")
+        has_quality = bool(class_bits & CLASS_QUALITY) and _QUALITY_RE.search(text_lower) is not None
+        
+        # Numeric patterns (e.g. "within 2 seconds") can't be expressed as keywords
+        if not has_performance:
+            has_performance = config.COMPILED_PERF_PATTERN_ALTERNATION.search(text_lower) is not None
+        
+        return fr_score, nfr_score, has_performance, has_quality, keyword_ids
     
     def calculate_keyword_score(self, text, keywords):
         """
@@ -29,14 +166,10 @@ class RequirementClassifier:
         Returns:
             int: Number of keyword matches
         """
-        text_lower = text.lower()
-        score = 0
-        
-        for keyword in keywords:
-            if keyword in text_lower:
-                score += 1
+        if not keywords:
+            return 0
         
-        return score
+        return keyword_score(_keyword_automaton(frozenset(keywords)), text.lower())
     
     def has_performance_indicators(self, text):
         """
@@ -48,17 +181,9 @@ class RequirementClassifier:
         Returns:
             bool: True if performance indicators found
         """
-        performance_patterns = [
-            r'\d+\s*(millisecond|second|minute|ms|s|min)',
-            r'within\s+\d+',
-            r'(fast|quick|speed|performance|load time|response time)',
-            r'concurrent\s+users?',
-            r'\d+%\s*(uptime|availability)'
-        ]
-        
         text_lower = text.lower()
-        for pattern in performance_patterns:
-            if re.search(pattern, text_lower):
+        for pattern in config.COMPILED_PERF_PATTERNS:
+            if pattern.search(text_lower):
                 return True
         
         return False
@@ -73,39 +198,26 @@ class RequirementClassifier:
         Returns:
             bool: True if quality attributes found
         """
-        quality_words = [
-            'secure', 'security', 'reliable', 'available', 'scalable',
-            'maintainable', 'usable', 'portable', 'efficient', 'stable',
-            'robust', 'user-friendly', 'intuitive', 'compatible'
-        ]
-        
-        text_lower = text.lower()
-        for word in quality_words:
-            if word in text_lower:
-                return True
-        
-        return False
+        return _QUALITY_RE.search(text) is not None
     
-    def classify_requirement(self, requirement_data):
+    def _classify_core_impl(self, requirement_lower, token_set=None):
         """
-        Classify a single requirement as FR or NFR
+        Score and classify a requirement string (cached, as it is pure)
         
         Args:
-            requirement_data (dict): Requirement data from extractor
+            requirement_lower (str): Lowercased extracted requirement text
+            token_set (frozenset): Lemmatized tokens to score FR/NFR keywords
+                against instead of the text (see config.KEYWORD_MATCHING)
             
         Returns:
-            dict: Classification result
+            tuple: (classification, confidence, fr_score, nfr_score, nfr_category)
         """
-        requirement = requirement_data['extracted_requirement']
-        original = requirement_data['original_sentence']
+        # Calculate scores and check for NFR indicators in one pass
+        fr_score, nfr_score, has_performance, has_quality, keyword_ids = self._fused_scan(requirement_lower)
         
-        # Calculate scores
-        fr_score = self.calculate_keyword_score(requirement, self.functional_keywords)
-        nfr_score = self.calculate_keyword_score(requirement, self.nfr_keywords)
-        
-        # Check for NFR indicators
-        has_performance = self.has_performance_indicators(requirement)
-        has_quality = self.has_quality_attributes(requirement)
+        if token_set is not None:
+            fr_score = len(token_set & self._functional_lemmas)
+            nfr_score = len(token_set & self._nfr_lemmas)
         
         # Add bonus scores for NFR indicators
         if has_performance:
@@ -128,67 +240,120 @@ class RequirementClassifier:
         # Determine NFR subcategory if classified as NFR
         nfr_category = None
         if classification == 'NFR':
-            nfr_category = self.identify_nfr_category(requirement)
+            nfr_category = self._category_from_keyword_ids(keyword_ids)
+        
+        return classification, round(confidence, 2), fr_score, nfr_score, nfr_category
+    
+    def _classify_batch(self, requirements_lower, lemmatized_tokens):
+        """
+        Score and classify a batch of requirement strings
+        
+        Args:
+            requirements_lower (list): Lowercased extracted requirement strings
+            lemmatized_tokens (list): Lemmatized token list for each requirement
+            
+        Returns:
+            list: One dict of classification and scores per requirement
+        """
+        if config.KEYWORD_MATCHING == 'token':
+            token_sets = [frozenset(tokens) for tokens in lemmatized_tokens]
+        else:
+            token_sets = [None] * len(requirements_lower)
         
+        classify_core = self._classify_core
+        return [
+            dict(zip(_SCORE_FIELDS, classify_core(requirement_lower, token_set)))
+            for requirement_lower, token_set in zip(requirements_lower, token_sets)
+        ]
+    
+    def _build_result(self, original, requirement, verbs, nouns, scores):
+        """
+        Combine extractor data with classification scores
+        
+        Args:
+            original (str): Original sentence
+            requirement (str): Extracted requirement
+            verbs (list): Verbs of the sentence
+            nouns (list): Nouns of the sentence
+            scores (dict): Classification and scores for the requirement
+            
+        Returns:
+            dict: Classification result
+        """
         return {
             'original_sentence': original,
             'requirement': requirement,
-            'classification': classification,
-            'confidence': round(confidence, 2),
-            'fr_score': fr_score,
-            'nfr_score': nfr_score,
-            'nfr_category': nfr_category,
-            'verbs': requirement_data['verbs'],
-            'nouns': requirement_data['nouns']
+            **scores,
+            'verbs': verbs,
+            'nouns': nouns
         }
     
-    def identify_nfr_category(self, text):
+    def classify_requirement(self, requirement_data):
         """
-        Identify the specific NFR category
+        Classify a single requirement as FR or NFR
         
         Args:
-            text (str): Requirement text
+            requirement_data (dict): Requirement data from extractor
             
         Returns:
-            str: NFR category name
+            dict: Classification result
         """
-        text_lower = text.lower()
-        
-        category_scores = {}
+        scores = self._classify_batch([requirement_data['extracted_requirement'].lower()],
+                                      [requirement_data['lemmatized_tokens']])[0]
+        return self._build_result(requirement_data['original_sentence'],
+                                  requirement_data['extracted_requirement'],
+                                  requirement_data['verbs'],
+                                  requirement_data['nouns'],
+                                  scores)
+    
+    def _category_from_keyword_ids(self, keyword_ids):
+        """
+        Pick the NFR category with the most matched keywords
         
-        for category, keywords in config.NFR_CATEGORIES.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in text_lower:
-                    score += 1
-            if score > 0:
-                category_scores[category] = score
+        Args:
+            keyword_ids (set): Matched keyword ids from a keyword scan
+            
+        Returns:
+            str: NFR category name
+        """
+        category_scores = Counter(KEYWORD_CATEGORY[keyword_id] for keyword_id in keyword_ids)
+        category_scores.pop(None, None)
         
         if category_scores:
-            # Return category with highest score
-            return max(category_scores, key=category_scores.get)
+            # Return category with highest score (ties go to the first in config order)
+            return max(config.NFR_CATEGORIES, key=category_scores.__getitem__)
         
         return 'general'
     
-    def classify_text(self, text):
+    def identify_nfr_category(self, text):
         """
-        Extract and classify all requirements from text
+        Identify the specific NFR category
         
         Args:
-            text (str): Input text containing user stories
+            text (str): Requirement text
             
         Returns:
-            dict: Classification results with FR and NFR lists
+            str: NFR category name
         """
-        # Extract requirements
-        requirements = self.extractor.extract_requirements_from_text(text)
+        return self._category_from_keyword_ids(self._scan_keyword_ids(text.lower()))
+    
+    def _classify_requirements(self, batch):
+        """
+        Classify extracted requirements into FR and NFR lists
         
-        # Classify each requirement
+        Args:
+            batch (ReqBatch): Requirements from the extractor
+            
+        Returns:
+            dict: Classification results with FR and NFR lists
+        """
         functional_requirements = []
         non_functional_requirements = []
         
-        for req_data in requirements:
-            classification = self.classify_requirement(req_data)
+        for original, requirement, verbs, nouns, scores in zip(
+                batch.originals, batch.requirements, batch.verbs, batch.nouns,
+                self._classify_batch(batch.requirements_lower, batch.lemmatized_tokens)):
+            classification = self._build_result(original, requirement, verbs, nouns, scores)
             
             if classification['classification'] == 'FR':
                 functional_requirements.append(classification)
@@ -198,11 +363,47 @@ class RequirementClassifier:
         return {
             'functional_requirements': functional_requirements,
             'non_functional_requirements': non_functional_requirements,
-            'total_requirements': len(requirements),
+            'total_requirements': len(batch),
             'fr_count': len(functional_requirements),
             'nfr_count': len(non_functional_requirements)
         }
     
+    def classify_text(self, text):
+        """
+        Extract and classify all requirements from text
+        
+        Args:
+            text (str): Input text containing user stories
+            
+        Returns:
+            dict: Classification results with FR and NFR lists
+        """
+        requirements = self.extractor.extract_requirements_from_text(text)
+        return self._classify_requirements(requirements)
+    
+    def classify_iterable(self, sentences, split_sentences=False):
+        """
+        Extract and classify requirements from individual sentences
+        
+        Each item (e.g. a CSV row) is treated as a single sentence, so the
+        input never has to be joined into one text and split again.
+        
+        Args:
+            sentences (iterable): Iterable of user story sentences
+            split_sentences (bool): Treat items as lines of text, which may
+                hold several sentences or a part of one, and split them into
+                sentences
+            
+        Returns:
+            dict: Classification results with FR and NFR lists
+        """
+        if split_sentences:
+            requirements = self.extractor.extract_requirements_from_lines(sentences)
+        else:
+            requirements = self.extractor.extract_requirements_from_sentences(sentences)
+        
+        return self._classify_requirements(requirements)
+    
     def format_output(self, results):
         """
         Format classification results for display
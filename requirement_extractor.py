@@ -4,9 +4,85 @@ Extracts requirements from user stories using NLP and pattern matching
 """
 
 import re
+from dataclasses import dataclass, field
+from functools import lru_cache
 from text_preprocessor import TextPreprocessor
 import config
 
+# Precompiled patterns for extracting the core requirement
+_RE_IWANT = re.compile(r'i (?:want|need|would like) (?:to )?(.*?)(?:\.|so that|$)')
+_RE_SYSTEM_MODAL = re.compile(r'(?:system|application) (?:should|must|shall|will) (.*?)(?:\.|$)')
+_RE_MODAL = re.compile(r'(?:should|must|shall|will) (.*?)(?:\.|$)')
+
+# Single-word requirement indicators, checked with a cheap token-set test
+_SINGLE_WORD_INDICATORS = frozenset(
+    indicator for indicator in config.REQUIREMENT_INDICATORS if ' ' not in indicator
+)
+
+
+@lru_cache(maxsize=4096)
+def _is_requirement_lower(sentence_lower):
+    """
+    Determine if an already lowercased sentence contains a requirement
+    
+    Args:
+        sentence_lower (str): Lowercased input sentence
+        
+    Returns:
+        bool: True if sentence contains requirement
+    """
+    # Fast path: a whole-word indicator such as "should" or "must"
+    if not _SINGLE_WORD_INDICATORS.isdisjoint(sentence_lower.split()):
+        return True
+    
+    # Check for requirement indicators (phrases, or inside other words)
+    for indicator in config.REQUIREMENT_INDICATORS:
+        if indicator in sentence_lower:
+            return True
+    
+    # Check for user story patterns
+    for pattern in config.COMPILED_USER_STORY_PATTERNS:
+        if pattern.search(sentence_lower):
+            return True
+    
+    return False
+
+
+@dataclass
+class ReqBatch:
+    """
+    Extracted requirements stored column-wise: one list per field,
+    index i of every list describing the same requirement
+    """
+    originals: list = field(default_factory=list)
+    requirements: list = field(default_factory=list)
+    requirements_lower: list = field(default_factory=list)
+    tokens: list = field(default_factory=list)
+    verbs: list = field(default_factory=list)
+    nouns: list = field(default_factory=list)
+    lemmatized_tokens: list = field(default_factory=list)
+    
+    def __len__(self):
+        return len(self.requirements)
+    
+    def rows(self):
+        """
+        Iterate over requirements as per-requirement dictionaries
+        
+        Yields:
+            dict: Requirement data with the same keys as the columns
+        """
+        for i in range(len(self)):
+            yield {
+                'original_sentence': self.originals[i],
+                'extracted_requirement': self.requirements[i],
+                'tokens': self.tokens[i],
+                'verbs': self.verbs[i],
+                'nouns': self.nouns[i],
+                'lemmatized_tokens': self.lemmatized_tokens[i]
+            }
+
+
 class RequirementExtractor:
     """
     Extracts requirement sentences from user stories
@@ -26,19 +102,7 @@ class RequirementExtractor:
         Returns:
             bool: True if sentence contains requirement
         """
-        sentence_lower = sentence.lower()
-        
-        # Check for requirement indicators
-        for indicator in config.REQUIREMENT_INDICATORS:
-            if indicator in sentence_lower:
-                return True
-        
-        # Check for user story patterns
-        for pattern in config.USER_STORY_PATTERNS:
-            if re.search(pattern, sentence_lower):
-                return True
-        
-        return False
+        return _is_requirement_lower(sentence.lower())
     
     def extract_requirement_from_user_story(self, sentence):
         """
@@ -50,60 +114,128 @@ class RequirementExtractor:
         Returns:
             str: Extracted requirement
         """
-        sentence_lower = sentence.lower()
+        return self._extract_requirement(sentence, sentence.lower())[0]
+    
+    def _extract_requirement(self, sentence, sentence_lower):
+        """
+        Extract the core requirement, along with its lowercased form
         
+        Args:
+            sentence (str): User story sentence
+            sentence_lower (str): The same sentence, lowercased
+            
+        Returns:
+            tuple: (requirement, requirement_lower)
+        """
         # Pattern: "As a X, I want to Y"
-        match = re.search(r'i (?:want|need|would like) (?:to )?(.*?)(?:\.|so that|$)', sentence_lower)
+        match = _RE_IWANT.search(sentence_lower)
         if match:
-            return match.group(1).strip()
+            requirement = match.group(1).strip()
+            return requirement, requirement
         
         # Pattern: "The system should/must/shall X"
-        match = re.search(r'(?:system|application) (?:should|must|shall|will) (.*?)(?:\.|$)', sentence_lower)
+        match = _RE_SYSTEM_MODAL.search(sentence_lower)
         if match:
-            return match.group(1).strip()
+            requirement = match.group(1).strip()
+            return requirement, requirement
         
         # Pattern: "should/must/shall X"
-        match = re.search(r'(?:should|must|shall|will) (.*?)(?:\.|$)', sentence_lower)
+        match = _RE_MODAL.search(sentence_lower)
         if match:
-            return match.group(1).strip()
+            requirement = match.group(1).strip()
+            return requirement, requirement
         
         # If no pattern matched, return the sentence as-is
-        return sentence.strip()
+        return sentence.strip(), sentence_lower.strip()
     
-    def extract_requirements_from_text(self, text):
+    def _extract_requirements(self, processed_sentences):
         """
-        Extract all requirements from text
+        Extract requirements from preprocessed sentence data
         
         Args:
-            text (str): Input text containing user stories
+            processed_sentences (iterable): Sentence results from the preprocessor
             
         Returns:
-            list: List of extracted requirements
+            ReqBatch: Extracted requirements
         """
-        # Preprocess text
-        preprocessed = self.preprocessor.preprocess_full_pipeline(text)
-        
-        requirements = []
+        batch = ReqBatch()
         
-        for sent_data in preprocessed['processed_sentences']:
+        for sent_data in processed_sentences:
             sentence = sent_data['sentence']
+            sentence_lower = sentence.lower()
             
             # Check if it's a requirement sentence
-            if self.is_requirement_sentence(sentence):
+            if _is_requirement_lower(sentence_lower):
                 # Extract the core requirement
-                requirement = self.extract_requirement_from_user_story(sentence)
+                requirement, requirement_lower = self._extract_requirement(sentence, sentence_lower)
                 
                 if requirement:
-                    requirements.append({
-                        'original_sentence': sentence,
-                        'extracted_requirement': requirement,
-                        'tokens': sent_data['tokens'],
-                        'verbs': sent_data['verbs'],
-                        'nouns': sent_data['nouns'],
-                        'lemmatized_tokens': sent_data['lemmatized_tokens']
-                    })
+                    batch.originals.append(sentence)
+                    batch.requirements.append(requirement)
+                    batch.requirements_lower.append(requirement_lower)
+                    batch.tokens.append(sent_data['tokens'])
+                    batch.verbs.append(sent_data['verbs'])
+                    batch.nouns.append(sent_data['nouns'])
+                    batch.lemmatized_tokens.append(sent_data['lemmatized_tokens'])
+        
+        return batch
+    
+    def extract_requirements_from_text(self, text):
+        """
+        Extract all requirements from text
+        
+        Args:
+            text (str): Input text containing user stories
+            
+        Returns:
+            ReqBatch: Extracted requirements
+        """
+        # Preprocess text
+        preprocessed = self.preprocessor.preprocess_full_pipeline(text, stream=True, views=True)
+        
+        return self._extract_requirements(preprocessed['processed_sentences'])
+    
+    def extract_requirements_from_sentences(self, sentences):
+        """
+        Extract requirements from text that is already split into sentences
+        
+        Each item is treated as one sentence, skipping sentence tokenization.
+        
+        Args:
+            sentences (iterable): Iterable of raw sentences (e.g. CSV rows)
+            
+        Returns:
+            ReqBatch: Extracted requirements
+        """
+        clean_text = self.preprocessor.clean_text
+        processed_sentences = (
+            self.preprocessor.preprocess_sentence(cleaned, views=True)
+            for cleaned in map(clean_text, sentences)
+            if cleaned
+        )
+        
+        return self._extract_requirements(processed_sentences)
+    
+    def extract_requirements_from_lines(self, lines):
+        """
+        Extract requirements from text given line by line
+        
+        Sentences may wrap across lines; the text is split as if it had been
+        given in one piece, but consumed as a stream instead of one string.
+        
+        Args:
+            lines (iterable): Iterable of lines of text
+            
+        Returns:
+            ReqBatch: Extracted requirements
+        """
+        preprocess = self.preprocessor.preprocess_sentence
+        processed_sentences = (
+            preprocess(sentence, views=True)
+            for sentence in self.preprocessor.tokenize_sentences_from_lines(lines)
+        )
         
-        return requirements
+        return self._extract_requirements(processed_sentences)
     
     def extract_key_phrases(self, requirement_data):
         """
@@ -149,7 +281,7 @@ if __name__ == "__main__":
     requirements = extractor.extract_requirements_from_text(test_text)
     
     print("=== Extracted Requirements ===\n")
-    for i, req in enumerate(requirements, 1):
+    for i, req in enumerate(requirements.rows(), 1):
         print(f"\n{i}. Original: {req['original_sentence']}")
         print(f"   Extracted: {req['extracted_requirement']}")
         print(f"   Verbs: {req['verbs']}")
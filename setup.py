@@ -0,0 +1,12 @@
+"""
+Build script for the optional Cython extension
+Run with: python setup.py build_ext --inplace
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='fr-nfr-extraction',
+    ext_modules=cythonize(['_scoring.pyx', '_tokens.pyx'], language_level=3),
+)
@@ -0,0 +1,59 @@
+"""
+Shared fixtures for the test suite
+
+Tests that run the NLP pipeline need the NLTK data downloaded (see
+README); they are skipped when it isn't available.
+"""
+
+import os
+import sys
+
+import nltk
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+import text_preprocessor
+
+
+def _has_nltk_data():
+    """Check whether the NLTK resources the pipeline needs are installed"""
+    resources = list(text_preprocessor._NLTK_RESOURCES)
+    if config.LEMMATIZER == 'wordnet':
+        resources += text_preprocessor._WORDNET_RESOURCES
+    
+    for path, _ in resources:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            return False
+    return True
+
+
+@pytest.fixture(scope='session')
+def nltk_data():
+    """Skip the test when the NLTK data isn't installed"""
+    if not _has_nltk_data():
+        pytest.skip('NLTK data not installed')
+
+
+@pytest.fixture(scope='session')
+def preprocessor(nltk_data):
+    """Shared TextPreprocessor"""
+    return text_preprocessor.TextPreprocessor()
+
+
+@pytest.fixture(scope='session')
+def classifier(nltk_data):
+    """Shared RequirementClassifier"""
+    from requirement_classifier import RequirementClassifier
+    return RequirementClassifier()
+
+
+@pytest.fixture(scope='session')
+def sample_lines():
+    """Lines of sample_data.txt"""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample_data.txt')
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
@@ -0,0 +1,139 @@
+"""
+Tests for the web application's analysis endpoints and background jobs
+"""
+
+import io
+import os
+import time
+
+import diskcache
+import pytest
+
+STORIES = (b'As a customer, I want to\nview my order history.\n'
+           b'The system should load\nwithin 2 seconds.\n')
+
+
+def _die(path):
+    """Job function whose process dies without returning"""
+    os._exit(1)
+
+
+def _fail(rows):
+    """Job function that raises"""
+    raise ValueError('bad rows')
+
+
+@pytest.fixture
+def app_module(nltk_data, tmp_path, monkeypatch):
+    """The app module with a fresh cache, job pool and temp directory"""
+    import app
+    import tempfile
+    
+    monkeypatch.setattr(app, 'cache', diskcache.Cache(str(tmp_path / 'cache')))
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    get_executor = app.get_executor
+    get_executor.cache_clear()
+    yield app
+    if get_executor.cache_info().currsize:
+        get_executor().shutdown()
+    get_executor.cache_clear()
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def _upload(client, data, filename='stories.txt'):
+    return client.post('/analyze_file', data={'file': (io.BytesIO(data), filename)},
+                       content_type='multipart/form-data')
+
+
+def _poll(client, status_url, timeout=60):
+    """Poll a job's status URL until it stops answering 202"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = client.get(status_url)
+        if response.status_code != 202:
+            return response
+        time.sleep(0.1)
+    pytest.fail('job did not finish')
+
+
+def _spooled_files(tmp_path):
+    return [name for name in os.listdir(tmp_path) if name.endswith('.txt')]
+
+
+def test_upload_job_lifecycle(client, tmp_path):
+    response = _upload(client, STORIES)
+    assert response.status_code == 202
+    status_url = response.get_json()['status_url']
+    
+    response = _poll(client, status_url)
+    assert response.status_code == 200
+    results = response.get_json()
+    
+    # The upload agrees with analyzing the same text directly
+    direct = client.post('/analyze', data={'text': STORIES.decode('utf-8')}).get_json()
+    assert results == direct
+    assert [fr['requirement'] for fr in results['functional_requirements']] == ['view my order history']
+    
+    # Results are handed out once; the job is gone afterwards
+    assert client.get(status_url).status_code == 404
+    assert _spooled_files(tmp_path) == []
+    
+    # The same file again is answered from the cache
+    response = _upload(client, STORIES)
+    assert response.status_code == 200
+    assert response.get_json() == results
+
+
+def test_unknown_job(client):
+    assert client.get('/analyze_status/nonexistent').status_code == 404
+
+
+def test_empty_upload(client, tmp_path):
+    response = _upload(client, b'\n   \n')
+    assert response.status_code == 400
+    assert _spooled_files(tmp_path) == []
+
+
+def test_failing_job_reports_error(client, app_module, monkeypatch):
+    monkeypatch.setattr(app_module, '_classify_rows_job', _fail)
+    
+    response = _upload(client, b'story\nThe system must be secure.\n', 'stories.csv')
+    assert response.status_code == 202
+    
+    response = _poll(client, response.get_json()['status_url'])
+    assert response.status_code == 500
+    assert response.get_json()['error'] == 'bad rows'
+
+
+def test_dead_job_process_reports_error_and_pool_recovers(client, app_module, monkeypatch, tmp_path):
+    classify_text_file_job = app_module._classify_text_file_job
+    monkeypatch.setattr(app_module, '_classify_text_file_job', _die)
+    
+    response = _upload(client, STORIES)
+    assert response.status_code == 202
+    
+    response = _poll(client, response.get_json()['status_url'])
+    assert response.status_code == 500
+    assert _spooled_files(tmp_path) == []
+    
+    # The broken pool is replaced, so later uploads still work
+    monkeypatch.setattr(app_module, '_classify_text_file_job', classify_text_file_job)
+    response = _upload(client, b'The system must be secure.\n')
+    assert response.status_code == 202
+    assert _poll(client, response.get_json()['status_url']).status_code == 200
+
+
+def test_failed_submit_removes_spooled_upload(client, app_module, monkeypatch, tmp_path):
+    class BrokenExecutor:
+        def submit(self, *args):
+            raise RuntimeError('cannot start job')
+    
+    monkeypatch.setattr(app_module, 'get_executor', BrokenExecutor)
+    
+    response = _upload(client, STORIES)
+    assert response.status_code == 500
+    assert _spooled_files(tmp_path) == []
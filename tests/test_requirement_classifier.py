@@ -0,0 +1,79 @@
+"""
+Tests for the requirement classifier
+"""
+
+import pytest
+
+import config
+from requirement_classifier import RequirementClassifier
+
+
+def _only_requirement(results):
+    requirements = results['functional_requirements'] + results['non_functional_requirements']
+    assert len(requirements) == 1
+    return requirements[0]
+
+
+def test_token_matching_counts_plural_keywords(nltk_data, monkeypatch):
+    monkeypatch.setattr(config, 'KEYWORD_MATCHING', 'token')
+    classifier = RequirementClassifier()
+    
+    result = _only_requirement(classifier.classify_text(
+        'The system must support concurrent users with latency in milliseconds.'))
+    
+    # concurrent, users, latency and milliseconds, plus the performance bonus
+    assert result['classification'] == 'NFR'
+    assert result['nfr_score'] == 4 + 3
+
+
+
+# classify_text(sample_data.txt): (requirement, classification, nfr_category,
+# confidence) in output order, functional requirements first
+SAMPLE_EXPECTED = [
+    ('register an account', 'FR', None, 0.5),
+    ('view my order history', 'FR', None, 0.5),
+    ('manage user permissions', 'FR', None, 0.5),
+    ('search for products by name', 'FR', None, 0.5),
+    ('add items to my shopping cart', 'FR', None, 0.5),
+    ('reset my password if i forget it', 'FR', None, 0.5),
+    ('upload product images', 'FR', None, 0.67),
+    ('comply with gdpr regulations', 'FR', None, 0.5),
+    ('be backed up daily', 'FR', None, 0.5),
+    ('track my order status', 'FR', None, 0.5),
+    ('generate sales reports', 'FR', None, 0.5),
+    ('load within 2 seconds', 'NFR', 'performance', 0.71),
+    ('be secure and protect user data', 'NFR', 'security', 0.75),
+    ('be available 99', 'NFR', 'reliability', 0.75),
+    ('be user-friendly and intuitive', 'NFR', 'usability', 0.8),
+    ('handle 1000 concurrent users', 'NFR', 'scalability', 0.83),
+    ('be compatible with major browsers', 'NFR', 'portability', 0.75),
+    ('respond within 500 milliseconds', 'NFR', 'performance', 0.86),
+]
+
+
+def _summary(results):
+    requirements = results['functional_requirements'] + results['non_functional_requirements']
+    return [
+        (result['requirement'], result['classification'], result['nfr_category'], result['confidence'])
+        for result in requirements
+    ]
+
+
+def test_classify_text_sample_data(classifier, sample_lines, monkeypatch):
+    monkeypatch.setattr(config, 'KEYWORD_MATCHING', 'substring')
+    results = classifier.classify_text('\n'.join(sample_lines))
+    
+    assert _summary(results) == SAMPLE_EXPECTED
+    assert (results['fr_count'], results['nfr_count'], results['total_requirements']) == (11, 7, 18)
+
+
+@pytest.mark.parametrize('split_sentences', [False, True])
+def test_classify_iterable_matches_classify_text(classifier, sample_lines, split_sentences):
+    expected = classifier.classify_text('\n'.join(sample_lines))
+    assert classifier.classify_iterable(sample_lines, split_sentences=split_sentences) == expected
+
+
+
+def test_calculate_keyword_score_accepts_keyword_sets(classifier):
+    assert classifier.calculate_keyword_score('Users can Search and VIEW', classifier.functional_keywords) == 2
+    assert classifier.calculate_keyword_score('anything', set()) == 0
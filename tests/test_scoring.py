@@ -0,0 +1,36 @@
+"""
+Tests for the keyword scoring loops
+"""
+
+import pytest
+
+import _scoring_py
+from requirement_classifier import KEYWORD_CLASS, KEYWORD_IDS, _build_automaton, _keyword_automaton
+
+TEXTS = [
+    '',
+    'the system should respond within 500 milliseconds',
+    'be secure and protect user data',
+    'users can search, view and update their profile securely',
+    'be user-friendly, scalable and available 99.9 of the time',
+]
+
+
+@pytest.fixture(scope='module')
+def automaton():
+    return _build_automaton(KEYWORD_IDS.items())
+
+
+def test_specialized_scan_matches_fused_scan(automaton):
+    scan = _scoring_py.build_specialized_scan(KEYWORD_IDS, KEYWORD_CLASS)
+    for text in TEXTS:
+        assert scan(text) == _scoring_py.fused_scan(automaton, text, KEYWORD_CLASS)
+
+
+def test_compiled_scoring_matches_python(automaton):
+    _scoring = pytest.importorskip('_scoring')
+    keywords = _keyword_automaton(frozenset(KEYWORD_IDS))
+    for text in TEXTS:
+        assert _scoring.fused_scan(automaton, text, KEYWORD_CLASS) == \
+            _scoring_py.fused_scan(automaton, text, KEYWORD_CLASS)
+        assert _scoring.keyword_score(keywords, text) == _scoring_py.keyword_score(keywords, text)
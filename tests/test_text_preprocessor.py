@@ -0,0 +1,100 @@
+"""
+Tests for the text preprocessor
+"""
+
+import json
+import pickle
+import random
+import string
+
+import pytest
+
+from text_preprocessor import _RE_CLEAN, SentenceResult
+
+
+def _whole_text_sentences(preprocessor, lines):
+    """Sentences from cleaning and splitting the lines as one text"""
+    return preprocessor.tokenize_sentences(preprocessor.clean_text('\n'.join(lines)))
+
+
+@pytest.mark.parametrize('lines', [
+    # Stories wrapped across lines
+    ['As a customer, I want to', 'view my order history.',
+     'The system should load', 'within 2 seconds.'],
+    # Lines without sentence-ending punctuation
+    ['As a user, I want to register an account',
+     'As an admin, I need to manage user permissions',
+     'The system must handle 1000 concurrent users'],
+    # Blank lines and lines with nothing left after cleaning
+    ['', 'As a user, I want to search for products.', '   ', '!!!',
+     'The system shall be available 99.9% of the time.', ''],
+    # Several sentences on one line, then a wrapped one
+    ['The system must be secure. The interface should be intuitive. As a',
+     'seller, I want to upload product images.'],
+    [],
+])
+def test_sentences_from_lines_match_whole_text(preprocessor, lines):
+    assert list(preprocessor.tokenize_sentences_from_lines(lines)) == \
+        _whole_text_sentences(preprocessor, lines)
+
+
+def test_sentences_from_lines_sample_file(preprocessor, sample_lines):
+    assert list(preprocessor.tokenize_sentences_from_lines(sample_lines)) == \
+        _whole_text_sentences(preprocessor, sample_lines)
+
+
+def test_sentences_from_lines_flushes_long_unterminated_text(preprocessor, monkeypatch):
+    import text_preprocessor
+    monkeypatch.setattr(text_preprocessor, '_MAX_PENDING_CHARS', 100)
+    
+    lines = ['as a user i want to log in %d' % i for i in range(50)]
+    sentences = list(preprocessor.tokenize_sentences_from_lines(lines))
+    
+    assert len(sentences) > 1
+    assert ' '.join(sentences) == preprocessor.clean_text('\n'.join(lines))
+
+
+SAMPLE_TEXT = (
+    'As a user, I want to search for products so that I can find items. '
+    'The system should load pages within 2 seconds. '
+    'As an admin, I need to manage user permissions.'
+)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_pipeline_returns_plain_dicts(preprocessor, stream):
+    results = preprocessor.preprocess_full_pipeline(SAMPLE_TEXT, stream=stream)
+    processed = list(results['processed_sentences'])
+    assert processed and all(type(sent_data) is dict for sent_data in processed)
+    processed[0]['tokens'].append('extra')
+    assert processed[0]['tokens'][-1] == 'extra'
+    results['processed_sentences'] = processed
+    json.dumps(results)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_pipeline_views_match_dicts(preprocessor, stream):
+    expected = preprocessor.preprocess_full_pipeline(SAMPLE_TEXT)['processed_sentences']
+    views = preprocessor.preprocess_full_pipeline(SAMPLE_TEXT, stream=stream, views=True)
+    processed = list(views['processed_sentences'])
+    assert all(isinstance(sent_data, SentenceResult) for sent_data in processed)
+    assert [sent_data.to_dict() for sent_data in processed] == expected
+    assert [pickle.loads(pickle.dumps(sent_data)).to_dict() for sent_data in processed] == expected
+
+
+def test_batch_views_share_document_arrays(preprocessor):
+    processed = preprocessor.preprocess_full_pipeline(SAMPLE_TEXT, views=True)['processed_sentences']
+    assert len({id(sent_data._tokens) for sent_data in processed}) == 1
+    assert len({id(sent_data._tags) for sent_data in processed}) == 1
+
+
+def test_clean_text_matches_regex(preprocessor):
+    # The ASCII fast path must clean exactly like the regex it replaces
+    rng = random.Random(0)
+    alphabet = string.printable + 'éÜß—… '
+    for _ in range(2000):
+        text = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(40)))
+        expected = _RE_CLEAN.sub(' ', text.lower()).strip()
+        assert preprocessor.clean_text(text) == expected, repr(text)
+        ascii_text = text.encode('ascii', 'ignore').decode()
+        assert preprocessor.clean_text(ascii_text) == _RE_CLEAN.sub(' ', ascii_text.lower()).strip()
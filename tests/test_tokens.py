@@ -0,0 +1,35 @@
+"""
+Tests for the per-sentence token loop
+"""
+
+import pytest
+
+import _tokens_py
+from text_preprocessor import _NOUN_TAGS, _VERB_TAGS
+
+POS_TAGS = [
+    ('as', 'IN'), ('a', 'DT'), ('user', 'NN'), ('i', 'PRP'), ('want', 'VBP'),
+    ('to', 'TO'), ('upload', 'VB'), ('product', 'NN'), ('images', 'NNS'), ('.', '.'),
+]
+STOP_WORDS = frozenset(['as', 'a', 'i', 'to'])
+
+
+def _lemma(token):
+    return token[:-1] if token.endswith('s') else token
+
+
+def test_python_process_tagged():
+    assert _tokens_py.process_tagged(POS_TAGS, STOP_WORDS, _lemma, _VERB_TAGS, _NOUN_TAGS) == (
+        ['want', 'upload'],
+        ['user', 'product', 'images'],
+        ['user', 'want', 'upload', 'product', 'images', '.'],
+        ['user', 'want', 'upload', 'product', 'image', '.'],
+    )
+
+
+def test_compiled_process_tagged_matches_python():
+    _tokens = pytest.importorskip('_tokens')
+    tokens, tags = zip(*POS_TAGS)
+    for make_tags in (list, lambda: POS_TAGS, lambda: zip(tokens, tags)):
+        assert _tokens.process_tagged(make_tags(), STOP_WORDS, _lemma, _VERB_TAGS, _NOUN_TAGS) == \
+            _tokens_py.process_tagged(make_tags(), STOP_WORDS, _lemma, _VERB_TAGS, _NOUN_TAGS)
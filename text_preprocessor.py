@@ -1,43 +1,363 @@
 """
 Text Preprocessing Module
-Handles all NLP preprocessing tasks using NLTK
+Handles all NLP preprocessing tasks using NLTK (or spaCy, see config.NLP_BACKEND)
 """
 
+import ahocorasick
 import nltk
 import re
-from nltk.tokenize import word_tokenize, sent_tokenize
+import string
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import islice
+from nltk.tokenize import word_tokenize, sent_tokenize, NLTKWordTokenizer
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
-from nltk.tag import pos_tag
+from nltk.tag.perceptron import PerceptronTagger
 import config
 
+try:
+    from _tokens import process_tagged
+except ImportError:
+    from _tokens_py import process_tagged
+
+# RE2 (pip install google-re2) scans in linear time without backtracking;
+# fall back to the standard library engine when it isn't installed
+try:
+    import re2 as _scan_re
+except ImportError:
+    _scan_re = re
+
+# Runs of characters other than word characters, periods, commas and hyphens
+# (special characters and whitespace alike) collapse to a single space
+_RE_CLEAN = re.compile(r'[^\w.,\-]+')
+
+# ASCII fast path for the same cleanup: str.translate blanks every character
+# _RE_CLEAN would remove, then space runs collapse to one
+_KEEP = frozenset(string.ascii_lowercase + string.digits + '_.,-')
+_ASCII_CLEAN_TABLE = {i: ' ' for i in range(128) if chr(i) not in _KEEP}
+_RE_WS = re.compile(r' {2,}')
+
+# Penn Treebank tag prefix -> WordNet part of speech
+_WORDNET_POS = {'J': 'a', 'V': 'v', 'R': 'r', 'N': 'n'}
+
+# NLTK data needed by the NLTK backend: (nltk.data path, download id)
+_NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('taggers/averaged_perceptron_tagger', 'averaged_perceptron_tagger'),
+]
+
+# Only needed by the WordNet lemmatizer
+_WORDNET_RESOURCES = [
+    ('corpora/wordnet', 'wordnet'),
+    ('corpora/omw-1.4', 'omw-1.4'),
+]
+
+# The word tokenizer behind word_tokenize, used directly on already split
+# sentences so Punkt does not run a second time
+_WORD_TOKENIZER = NLTKWordTokenizer()
+
+def _build_indicator_automaton():
+    """Build an Aho-Corasick automaton yielding (id, phrase) per requirement indicator"""
+    automaton = ahocorasick.Automaton()
+    for i, phrase in enumerate(config.REQUIREMENT_INDICATORS):
+        automaton.add_word(phrase.lower(), (i, phrase))
+    automaton.make_automaton()
+    return automaton
+
+_INDICATOR_AUTOMATON = _build_indicator_automaton()
+
+# Requirement indicators and NFR cue phrases found by scan_requirements; a
+# match reports the index of its phrase in this tuple
+SCAN_PHRASES = tuple(dict.fromkeys(config.REQUIREMENT_INDICATORS + config.NON_FUNCTIONAL_KEYWORDS))
+
+# All phrases in one alternation with a group per phrase, longest first so
+# that "response time" wins over a shorter phrase starting at the same place
+_SCAN_ORDER = sorted(range(len(SCAN_PHRASES)), key=lambda i: -len(SCAN_PHRASES[i]))
+_SCAN_PATTERN = _scan_re.compile('|'.join(f'({re.escape(SCAN_PHRASES[i])})' for i in _SCAN_ORDER))
+
+# Per-sentence outputs that preprocess_full_pipeline can produce, and the
+# result key of each
+_COMPONENT_KEYS = {
+    'tokens': 'tokens',
+    'pos': 'pos_tags',
+    'verbs': 'verbs',
+    'nouns': 'nouns',
+    'filtered': 'filtered_tokens',
+    'lemmas': 'lemmatized_tokens',
+}
+ALL_COMPONENTS = tuple(_COMPONENT_KEYS)
+
+# Longest run of text tokenize_sentences_from_lines holds back waiting for a
+# sentence to end
+_MAX_PENDING_CHARS = 100_000
+
+# Set once the resources have been probed, so later instances skip the check
+_resources_checked = False
+
+# Penn Treebank verb and noun tags
+_VERB_TAGS = frozenset({'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ'})
+_NOUN_TAGS = frozenset({'NN', 'NNS', 'NNP', 'NNPS'})
+
+def _check_components(components):
+    """
+    Validate the components= argument of preprocess_full_pipeline
+    
+    Args:
+        components (iterable): Names of per-sentence outputs
+        
+    Returns:
+        frozenset: The component names
+        
+    Raises:
+        ValueError: If components is a string or names an unknown output
+    """
+    if isinstance(components, str):
+        raise ValueError(f"components must be a collection of names, not the string {components!r}")
+    
+    components = frozenset(components)
+    unknown = components.difference(ALL_COMPONENTS)
+    if unknown:
+        raise ValueError(
+            f"Unknown components {sorted(unknown)}; expected names from {list(ALL_COMPONENTS)}"
+        )
+    return components
+
+def _intern_tokens(tokens):
+    """
+    Intern ASCII tokens so repeated words share one string object
+    
+    User stories repeat the same few words constantly; interned tokens save
+    memory and make set and dict lookups compare by identity.
+    """
+    intern = sys.intern
+    return [intern(token) if token.isascii() else token for token in tokens]
+
+def _chunked(iterable, size):
+    """Yield successive lists of up to size items from iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class SentenceResult(Mapping):
+    """
+    Preprocessing results for one sentence
+    
+    Returned instead of a plain dict when views=True is passed to the
+    pipeline. A result only records its [start, end) range in a token and a
+    tag array; in batch mode all sentences of a document share one pair of
+    arrays, while streamed results each own theirs so that consumed
+    sentences can be freed. Verbs, nouns, filtered and lemmatized tokens are
+    derived on first access, or before the result is pickled, so sentences
+    whose outputs are never read skip that work.
+    
+    Results are read-only mappings with the keys of the plain dicts:
+    result['verbs'], 'verbs' in result, .get() and .items() all work, but
+    'tokens' and 'pos_tags' are rebuilt on each access, so changes made to
+    them are not kept. Use to_dict() for a mutable, JSON-serializable copy.
+    """
+    
+    __slots__ = ('sentence', '_tokens', '_tags', '_start', '_end', '_derived')
+    
+    KEYS = ('sentence', 'tokens', 'pos_tags', 'verbs', 'nouns', 'filtered_tokens', 'lemmatized_tokens')
+    
+    def __init__(self, sentence, tokens, tags, start, end):
+        self.sentence = sentence
+        self._tokens = tokens
+        self._tags = tags
+        self._start = start
+        self._end = end
+        self._derived = None
+    
+    @property
+    def tokens(self):
+        return self._tokens[self._start:self._end]
+    
+    @property
+    def pos_tags(self):
+        return list(zip(self.tokens, self._tags[self._start:self._end]))
+    
+    def _derive(self):
+        """Compute verbs, nouns, filtered and lemmatized tokens in one pass"""
+        if self._derived is None:
+            self._derived = process_tagged(
+                zip(self.tokens, self._tags[self._start:self._end]),
+                TextPreprocessor._get_stop_words(),
+                TextPreprocessor._get_lemma(),
+                _VERB_TAGS,
+                _NOUN_TAGS
+            )
+        return self._derived
+    
+    @property
+    def verbs(self):
+        return self._derive()[0]
+    
+    @property
+    def nouns(self):
+        return self._derive()[1]
+    
+    @property
+    def filtered_tokens(self):
+        return self._derive()[2]
+    
+    @property
+    def lemmatized_tokens(self):
+        return self._derive()[3]
+    
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(self.KEYS)
+    
+    def __len__(self):
+        return len(self.KEYS)
+    
+    def __getstate__(self):
+        # Derive before pickling, so the work is done where the result was
+        # made (e.g. in a joblib worker) rather than where it is read
+        self._derive()
+        return {name: getattr(self, name) for name in self.__slots__}
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    def to_dict(self):
+        """
+        Materialize the result as a plain dictionary (e.g. for json.dumps)
+        
+        Returns:
+            dict: Dictionary containing preprocessing results for the sentence
+        """
+        return dict(self)
+
+
 class TextPreprocessor:
     """
     Preprocesses text using NLTK techniques
     """
     
+    # Resources shared by all instances, loaded on first use
+    _lemmatizer = None
+    _lemma_cache = None
+    _stop_words = None
+    _pos_tagger = None
+    
     def __init__(self):
         """Initialize preprocessor and download required NLTK data"""
-        self.lemmatizer = WordNetLemmatizer()
         self._download_nltk_resources()
-        self.stop_words = set(stopwords.words('english'))
-        # Remove requirement indicators from stopwords
-        for word in config.REQUIREMENT_INDICATORS:
-            for w in word.split():
-                if w in self.stop_words:
-                    self.stop_words.remove(w)
+        self.lemmatizer = self._get_lemmatizer()
+        self.stop_words = self._get_stop_words()
+        self._init_models()
+    
+    @classmethod
+    def _get_lemmatizer(cls):
+        """Return the shared WordNet lemmatizer"""
+        if cls._lemmatizer is None:
+            cls._lemmatizer = WordNetLemmatizer()
+        return cls._lemmatizer
+    
+    @classmethod
+    def _get_lemma(cls):
+        """Return the shared memoized lemmatize function"""
+        if cls._lemma_cache is None:
+            if config.LEMMATIZER == 'simplemma':
+                import simplemma
+                
+                def lemmatize(word, pos='n'):
+                    return simplemma.lemmatize(word, lang='en')
+            else:
+                lemmatize = cls._get_lemmatizer().lemmatize
+            # User stories repeat the same words constantly
+            cls._lemma_cache = lru_cache(maxsize=100_000)(lemmatize)
+        return cls._lemma_cache
+    
+    @classmethod
+    def _get_stop_words(cls):
+        """Return the shared stopword set"""
+        if cls._stop_words is None:
+            # Stopwords, minus the words making up requirement indicators
+            cls._stop_words = frozenset(w.lower() for w in stopwords.words('english')) - {
+                w.lower() for phrase in config.REQUIREMENT_INDICATORS for w in phrase.split()
+            }
+        return cls._stop_words
+    
+    @classmethod
+    def _get_tagger(cls):
+        """Return the shared POS tagger"""
+        if cls._pos_tagger is None:
+            # One loaded tagger; nltk.pos_tag would reload the model on every call
+            cls._pos_tagger = PerceptronTagger()
+        return cls._pos_tagger
+    
+    def _init_models(self):
+        """Attach the shared lemmatizer cache and tagger, and load spaCy if enabled"""
+        self._lemma = self._get_lemma()
+        self._tagger = self._get_tagger()
+        
+        self._sentencizer = None
+        self.nlp = None
+        if config.NLP_BACKEND == 'spacy':
+            self.nlp = self._load_spacy()
+    
+    def __getstate__(self):
+        """Pickle without the caches and loaded models (e.g. for joblib workers)"""
+        state = self.__dict__.copy()
+        for name in ('_lemma', '_tagger', '_sentencizer', 'nlp'):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state):
+        """Restore a pickled preprocessor, reloading the models"""
+        self.__dict__.update(state)
+        self._init_models()
+    
+    def _load_spacy(self):
+        """Load the spaCy pipeline with only the components we need"""
+        import spacy
+        
+        # Sentence boundaries come from the lightweight senter, not the parser
+        nlp = spacy.load(config.SPACY_MODEL, disable=['parser', 'ner', 'textcat'])
+        if 'senter' in nlp.disabled:
+            nlp.enable_pipe('senter')
+        return nlp
     
     def _download_nltk_resources(self):
         """Download necessary NLTK resources if not already present"""
-        resources = ['punkt', 'stopwords', 'wordnet', 'averaged_perceptron_tagger', 'omw-1.4']
-        for resource in resources:
+        global _resources_checked
+        if _resources_checked:
+            return
+        
+        resources = list(_NLTK_RESOURCES)
+        if config.LEMMATIZER == 'wordnet':
+            resources += _WORDNET_RESOURCES
+        
+        for path, resource in resources:
             try:
-                nltk.data.find(f'tokenizers/{resource}')
+                nltk.data.find(path)
             except LookupError:
                 try:
                     nltk.download(resource, quiet=True)
                 except:
                     pass
+        _resources_checked = True
+    
+    def _get_sentencizer(self):
+        """Create the rule-based spaCy sentencizer on first use"""
+        if self._sentencizer is None:
+            import spacy
+            self._sentencizer = spacy.blank('en')
+            self._sentencizer.add_pipe('sentencizer')
+        return self._sentencizer
     
     def clean_text(self, text):
         """
@@ -49,16 +369,47 @@ class TextPreprocessor:
         Returns:
             str: Cleaned text
         """
-        # Convert to lowercase
+        # Lowercase, then replace special characters (keeping periods, commas
+        # and hyphens) and whitespace runs with a single space
         text = text.lower()
+        if text.isascii():
+            return _RE_WS.sub(' ', text.translate(_ASCII_CLEAN_TABLE)).strip()
+        return _RE_CLEAN.sub(' ', text).strip()
+    
+    def find_indicators(self, text):
+        """
+        Find every requirement indicator in text in a single pass
         
-        # Remove special characters but keep periods and commas
-        text = re.sub(r'[^\w\s\.\,\-]', ' ', text)
+        Unlike scan_requirements, overlapping matches are all reported.
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        Args:
+            text (str): Input text
+            
+        Yields:
+            tuple: (end_offset, (indicator_id, phrase)), where end_offset is
+                the offset of the last matched character in text.lower() and
+                indicator_id indexes config.REQUIREMENT_INDICATORS
+        """
+        return _INDICATOR_AUTOMATON.iter(text.lower())
+    
+    def scan_requirements(self, text):
+        """
+        Find requirement indicators and NFR cue phrases in one pass
+        
+        Phrases match anywhere in the lowercased text, like the substring
+        checks of the extractor and classifier; matches do not overlap.
         
-        return text.strip()
+        Args:
+            text (str): Input text
+            
+        Returns:
+            list: List of (phrase_id, start, end) tuples, where phrase_id
+                indexes SCAN_PHRASES and start/end are offsets into text.lower()
+        """
+        return [
+            (_SCAN_ORDER[match.lastindex - 1], match.start(), match.end())
+            for match in _SCAN_PATTERN.finditer(text.lower())
+        ]
     
     def tokenize_sentences(self, text):
         """
@@ -70,11 +421,88 @@ class TextPreprocessor:
         Returns:
             list: List of sentences
         """
+        if config.SENTENCE_SPLITTER == 'spacy':
+            return [sent.text for sent in self._get_sentencizer()(text).sents]
+        
         return sent_tokenize(text)
     
+    def tokenize_sentences_from_lines(self, lines):
+        """
+        Clean and split text given line by line into sentences
+        
+        Gives the same sentences as tokenize_sentences(clean_text(text)) on
+        the whole text, while reading it as a stream. Each line is cleaned
+        once. Sentences may wrap across lines, so text is held back until a
+        line with a period arrives, and the last sentence found is always
+        held back for the text that follows it. A run of text longer than
+        _MAX_PENDING_CHARS without a sentence end is split as it stands.
+        
+        Args:
+            lines (iterable): Iterable of lines of raw text
+            
+        Yields:
+            str: Cleaned sentences
+        """
+        pending = []
+        pending_size = 0
+        for line in lines:
+            piece = self.clean_text(line)
+            if not piece:
+                continue
+            
+            pending.append(piece)
+            pending_size += len(piece) + 1
+            
+            # Only a period can end a sentence in cleaned text
+            overflow = pending_size > _MAX_PENDING_CHARS
+            if '.' not in piece and not overflow:
+                continue
+            
+            sentences = self.tokenize_sentences(' '.join(pending))
+            if overflow:
+                yield from sentences
+                pending = []
+                pending_size = 0
+            else:
+                yield from sentences[:-1]
+                pending = sentences[-1:]
+                pending_size = sum(len(sentence) + 1 for sentence in pending)
+        
+        if pending:
+            yield from self.tokenize_sentences(' '.join(pending))
+    
+    def tokenize_sentences_batch(self, texts, batch_size=256):
+        """
+        Split many texts into sentences
+        
+        Args:
+            texts (iterable): Input texts
+            batch_size (int): Number of texts per spaCy batch
+            
+        Returns:
+            list: List of sentence lists, one per text
+        """
+        if config.SENTENCE_SPLITTER == 'spacy':
+            docs = self._get_sentencizer().pipe(texts, batch_size=batch_size)
+            return [[sent.text for sent in doc.sents] for doc in docs]
+        
+        return [sent_tokenize(text) for text in texts]
+    
     def tokenize_words(self, text):
         """
-        Split text into words
+        Split a single, already split sentence into words
+        
+        Args:
+            text (str): Input sentence
+            
+        Returns:
+            list: List of words
+        """
+        return _intern_tokens(_WORD_TOKENIZER.tokenize(text))
+    
+    def tokenize_document_words(self, text):
+        """
+        Split text that may hold several sentences into words
         
         Args:
             text (str): Input text
@@ -82,7 +510,7 @@ class TextPreprocessor:
         Returns:
             list: List of words
         """
-        return word_tokenize(text)
+        return _intern_tokens(word_tokenize(text))
     
     def remove_stopwords(self, tokens):
         """
@@ -94,7 +522,21 @@ class TextPreprocessor:
         Returns:
             list: Filtered tokens
         """
-        return [token for token in tokens if token.lower() not in self.stop_words]
+        stop_words = self.stop_words
+        return [token for token in tokens if token.lower() not in stop_words]
+    
+    def remove_stopwords_lower(self, tokens):
+        """
+        Remove stopwords from a list of already lowercased tokens
+        
+        Args:
+            tokens (list): List of lowercase tokens
+            
+        Returns:
+            list: Filtered tokens
+        """
+        stop_words = self.stop_words
+        return [token for token in tokens if token not in stop_words]
     
     def lemmatize(self, tokens):
         """
@@ -106,7 +548,21 @@ class TextPreprocessor:
         Returns:
             list: Lemmatized tokens
         """
-        return [self.lemmatizer.lemmatize(token) for token in tokens]
+        lemma = self._lemma
+        return [lemma(token) for token in tokens]
+    
+    def lemmatize_pos(self, pos_tags):
+        """
+        Apply POS-aware lemmatization to tagged tokens
+        
+        Args:
+            pos_tags (list): List of (token, pos_tag) tuples
+            
+        Returns:
+            list: Lemmatized tokens
+        """
+        lemma = self._lemma
+        return [lemma(token, _WORDNET_POS.get(tag[:1], 'n')) for token, tag in pos_tags]
     
     def pos_tagging(self, tokens):
         """
@@ -118,7 +574,19 @@ class TextPreprocessor:
         Returns:
             list: List of (token, pos_tag) tuples
         """
-        return pos_tag(tokens)
+        return self._tagger.tag(tokens)
+    
+    def pos_tagging_batch(self, token_lists):
+        """
+        Perform Part-of-Speech tagging on several token lists at once
+        
+        Args:
+            token_lists (list): List of token lists, one per sentence
+            
+        Returns:
+            list: List of (token, pos_tag) tuple lists, one per sentence
+        """
+        return self._tagger.tag_sents(token_lists)
     
     def extract_verbs(self, pos_tags):
         """
@@ -130,7 +598,7 @@ class TextPreprocessor:
         Returns:
             list: List of verbs
         """
-        return [token for token, tag in pos_tags if tag.startswith('VB')]
+        return [token for token, tag in pos_tags if tag in _VERB_TAGS]
     
     def extract_nouns(self, pos_tags):
         """
@@ -142,21 +610,198 @@ class TextPreprocessor:
         Returns:
             list: List of nouns
         """
-        return [token for token, tag in pos_tags if tag.startswith('NN')]
+        return [token for token, tag in pos_tags if tag in _NOUN_TAGS]
+    
+    def extract_verbs_and_nouns(self, pos_tags):
+        """
+        Extract verbs and nouns from POS tagged tokens in a single pass
+        
+        Args:
+            pos_tags (list): List of (token, pos_tag) tuples
+            
+        Returns:
+            tuple: (verbs, nouns)
+        """
+        verbs = []
+        nouns = []
+        for token, tag in pos_tags:
+            if tag in _VERB_TAGS:
+                verbs.append(token)
+            elif tag in _NOUN_TAGS:
+                nouns.append(token)
+        return verbs, nouns
+    
+    def preprocess_sentence(self, sentence, views=False):
+        """
+        Preprocessing pipeline for a single, already split sentence
+        
+        Args:
+            sentence (str): Cleaned sentence
+            views (bool): Return a SentenceResult instead of a dict (NLTK
+                backend only)
+            
+        Returns:
+            dict or SentenceResult: Preprocessing results for the sentence
+        """
+        if self.nlp is not None:
+            return self._preprocess_span(self.nlp(sentence))
+        
+        # Word tokenization (rows may still hold several sentences)
+        tokens = self.tokenize_document_words(sentence)
+        
+        # POS tagging (before removing stopwords to maintain context)
+        pos_tags = self.pos_tagging(tokens)
+        
+        return self._preprocess_tagged(sentence, tokens, pos_tags, views)
+    
+    def _preprocess_tagged(self, sentence, tokens, pos_tags, views=False):
+        """
+        Finish the sentence pipeline once tokens are POS tagged
+        
+        Args:
+            sentence (str): Cleaned sentence
+            tokens (list): Tokens of the sentence
+            pos_tags (list): List of (token, pos_tag) tuples
+            views (bool): Return a SentenceResult instead of a dict
+            
+        Returns:
+            dict or SentenceResult: Preprocessing results for the sentence
+        """
+        if views:
+            return SentenceResult(sentence, tokens, [tag for _, tag in pos_tags], 0, len(tokens))
+        
+        # One pass over the tagged tokens: extract verbs and nouns, remove
+        # stopwords (the sentence is already lowercased by clean_text) and
+        # lemmatize what is left
+        verbs, nouns, filtered_tokens, lemmatized_tokens = process_tagged(
+            pos_tags, self.stop_words, self._lemma, _VERB_TAGS, _NOUN_TAGS
+        )
+        
+        return {
+            'sentence': sentence,
+            'tokens': tokens,
+            'pos_tags': pos_tags,
+            'verbs': verbs,
+            'nouns': nouns,
+            'filtered_tokens': filtered_tokens,
+            'lemmatized_tokens': lemmatized_tokens
+        }
+    
+    def _preprocess_span(self, span):
+        """
+        Build sentence results from a spaCy span (spaCy backend)
+        
+        Args:
+            span: spaCy Span or Doc covering one sentence
+            
+        Returns:
+            dict: Dictionary containing preprocessing results for the sentence
+        """
+        pos_tags = [(token.text, token.tag_) for token in span]
+        verbs, nouns = self.extract_verbs_and_nouns(pos_tags)
+        kept = [token for token in span if token.lower_ not in self.stop_words]
+        
+        return {
+            'sentence': span.text,
+            'tokens': [token.text for token in span],
+            'pos_tags': pos_tags,
+            'verbs': verbs,
+            'nouns': nouns,
+            'filtered_tokens': [token.text for token in kept],
+            'lemmatized_tokens': [token.lemma_ for token in kept]
+        }
+    
+    def _results_from_doc(self, text, cleaned_text, doc, stream=False):
+        """Assemble full pipeline results from a spaCy Doc (spaCy backend)"""
+        sentences = list(doc.sents)
+        processed = (self._preprocess_span(sent) for sent in sentences)
+        
+        return {
+            'original_text': text,
+            'cleaned_text': cleaned_text,
+            'sentences': [sent.text for sent in sentences],
+            'processed_sentences': processed if stream else list(processed)
+        }
+    
+    def preprocess_many(self, texts, batch_size=64):
+        """
+        Run the full pipeline over many texts
+        
+        With the spaCy backend texts are processed in batches by nlp.pipe.
+        
+        Args:
+            texts (iterable): Raw input texts
+            batch_size (int): Number of texts per spaCy batch
+            
+        Returns:
+            list: Pipeline results for each text
+        """
+        return list(self.process_stream(texts, batch_size=batch_size))
     
-    def preprocess_full_pipeline(self, text):
+    def process_stream(self, texts, batch_size=64):
+        """
+        Run the full pipeline over many texts, yielding results lazily
+        
+        Texts are read batch_size at a time, so only one batch is held in
+        memory; with the spaCy backend each batch goes through nlp.pipe.
+        
+        Args:
+            texts (iterable): Raw input texts
+            batch_size (int): Number of texts per batch
+            
+        Yields:
+            dict: Pipeline results for each text, in input order
+        """
+        for batch in _chunked(texts, batch_size):
+            if self.nlp is None:
+                for text in batch:
+                    yield self.preprocess_full_pipeline(text)
+                continue
+            
+            cleaned_texts = [self.clean_text(text) for text in batch]
+            docs = self.nlp.pipe(cleaned_texts, batch_size=batch_size, n_process=1)
+            for text, cleaned_text, doc in zip(batch, cleaned_texts, docs):
+                yield self._results_from_doc(text, cleaned_text, doc)
+    
+    def preprocess_full_pipeline(self, text, stream=False, components=ALL_COMPONENTS, views=False):
         """
         Complete preprocessing pipeline
         
         Args:
             text (str): Raw input text
+            stream (bool): Return 'processed_sentences' as a generator that
+                processes each sentence on demand, instead of a list
+            components (iterable): Per-sentence outputs to produce, out of
+                'tokens', 'pos', 'verbs', 'nouns', 'filtered' and 'lemmas';
+                the keys of the others are left out. Without 'pos' no verbs
+                or nouns are produced, and with none only the sentences are
+                split. The NLTK backend skips the work for disabled outputs.
+            views (bool): With the NLTK backend and all components, hold
+                SentenceResult views in 'processed_sentences' instead of
+                dicts, deriving verbs, nouns and lemmas only when read
             
         Returns:
             dict: Dictionary containing all preprocessing results
+            
+        Raises:
+            ValueError: If components is a string or names an unknown output
         """
+        components = _check_components(components)
+        partial = not components.issuperset(ALL_COMPONENTS)
+        
         # Clean text
         cleaned_text = self.clean_text(text)
         
+        if self.nlp is not None:
+            results = self._results_from_doc(text, cleaned_text, self.nlp(cleaned_text), stream)
+            if partial:
+                selected = (
+                    self._select_components(sent_data, components)
+                    for sent_data in results['processed_sentences']
+                )
+                results['processed_sentences'] = selected if stream else list(selected)
+            return results
+        
         # Tokenize into sentences
         sentences = self.tokenize_sentences(cleaned_text)
         
@@ -167,37 +812,111 @@ class TextPreprocessor:
             'processed_sentences': []
         }
         
-        # Process each sentence
+        if partial:
+            processed = (self._preprocess_components(sentence, components) for sentence in sentences)
+            results['processed_sentences'] = processed if stream else list(processed)
+            return results
+        
+        if stream:
+            results['processed_sentences'] = self._iter_processed_sentences(sentences, views)
+            return results
+        
+        # Tokenize and POS tag all sentences in one batch
+        all_tokens = [self.tokenize_words(sentence) for sentence in sentences]
+        all_tags = self.pos_tagging_batch(all_tokens)
+        
+        if not views:
+            results['processed_sentences'] = [
+                self._preprocess_tagged(sentence, tokens, pos_tags)
+                for sentence, tokens, pos_tags in zip(sentences, all_tokens, all_tags)
+            ]
+            return results
+        
+        # Keep one token array and one tag array for the whole document;
+        # each sentence result is a range over them
+        doc_tokens = []
+        doc_tags = []
+        for sentence, tokens, pos_tags in zip(sentences, all_tokens, all_tags):
+            start = len(doc_tokens)
+            doc_tokens.extend(tokens)
+            doc_tags.extend(tag for _, tag in pos_tags)
+            results['processed_sentences'].append(
+                SentenceResult(sentence, doc_tokens, doc_tags, start, len(doc_tokens))
+            )
+        
+        return results
+    
+    def _iter_processed_sentences(self, sentences, views=False):
+        """Tokenize, tag and process split sentences one at a time"""
         for sentence in sentences:
-            # Word tokenization
             tokens = self.tokenize_words(sentence)
+            yield self._preprocess_tagged(sentence, tokens, self.pos_tagging(tokens), views)
+    
+    def _preprocess_components(self, sentence, components):
+        """
+        Sentence pipeline producing only the requested outputs
+        
+        Args:
+            sentence (str): Cleaned sentence
+            components (frozenset): Outputs to produce (see preprocess_full_pipeline)
             
-            # POS tagging (before removing stopwords to maintain context)
+        Returns:
+            dict: Dictionary containing the requested results for the sentence
+        """
+        result = {'sentence': sentence}
+        if not components:
+            return result
+        
+        tokens = self.tokenize_words(sentence)
+        if 'tokens' in components:
+            result['tokens'] = tokens
+        
+        if 'pos' in components:
             pos_tags = self.pos_tagging(tokens)
+            result['pos_tags'] = pos_tags
+            if 'verbs' in components or 'nouns' in components:
+                verbs, nouns = self.extract_verbs_and_nouns(pos_tags)
+                if 'verbs' in components:
+                    result['verbs'] = verbs
+                if 'nouns' in components:
+                    result['nouns'] = nouns
+        
+        if 'filtered' in components or 'lemmas' in components:
+            filtered_tokens = self.remove_stopwords_lower(tokens)
+            if 'filtered' in components:
+                result['filtered_tokens'] = filtered_tokens
+            if 'lemmas' in components:
+                result['lemmatized_tokens'] = self.lemmatize(filtered_tokens)
+        
+        return result
+    
+    def _select_components(self, sent_data, components):
+        """Keep only the requested outputs of full sentence results"""
+        if 'pos' not in components:
+            components = components - {'verbs', 'nouns'}
+        keep = {'sentence'} | {_COMPONENT_KEYS[name] for name in components}
+        return {key: value for key, value in sent_data.items() if key in keep}
+    
+    def preprocess_documents(self, texts, n_jobs=-1, batch_size="auto"):
+        """
+        Run the full pipeline over many independent texts in parallel
+        
+        Texts are spread over worker processes with joblib's loky backend;
+        results come back in input order.
+        
+        Args:
+            texts (iterable): Raw input texts
+            n_jobs (int): Number of worker processes (-1 uses all cores)
+            batch_size (int or str): Texts sent to a worker at a time
             
-            # Extract verbs and nouns
-            verbs = self.extract_verbs(pos_tags)
-            nouns = self.extract_nouns(pos_tags)
-            
-            # Remove stopwords
-            filtered_tokens = self.remove_stopwords(tokens)
-            
-            # Lemmatization
-            lemmatized_tokens = self.lemmatize(filtered_tokens)
-            
-            sentence_data = {
-                'sentence': sentence,
-                'tokens': tokens,
-                'pos_tags': pos_tags,
-                'verbs': verbs,
-                'nouns': nouns,
-                'filtered_tokens': filtered_tokens,
-                'lemmatized_tokens': lemmatized_tokens
-            }
-            
-            results['processed_sentences'].append(sentence_data)
+        Returns:
+            list: Pipeline results for each text
+        """
+        from joblib import Parallel, delayed
         
-        return results
+        return Parallel(n_jobs=n_jobs, batch_size=batch_size, backend="loky")(
+            delayed(self.preprocess_full_pipeline)(text) for text in texts
+        )
 
 
 if __name__ == "__main__":